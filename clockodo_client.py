@@ -4,9 +4,11 @@ Provides async HTTP client for Clockodo REST API with authentication.
 """
 
 import os
+import time
+import asyncio
 import logging
-from datetime import datetime, date
-from typing import Optional, Dict, List, Any
+from datetime import datetime, date, timedelta
+from typing import Optional, Dict, List, Any, Awaitable, Callable, Tuple
 import httpx
 from dotenv import load_dotenv
 
@@ -21,12 +23,57 @@ class ClockodoAPIError(Exception):
 
 logger = logging.getLogger(__name__)
 
+# Cache lifetimes (seconds) for lookups that rarely change during a session
+RESOURCE_CACHE_TTL = 300
+USER_ID_CACHE_TTL = 3600
+
+# Retry policy: only reads are retried at the application layer. DELETE is
+# excluded because a replayed DELETE /clock or /entries/{id} whose first
+# attempt succeeded (but timed out reading the response) gets a 4xx, which
+# would report an error for a stop/delete that actually happened.
+RETRYABLE_METHODS = frozenset({"GET"})
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.1
+
+# Name lookup index: (exact lowercase name -> item, [(lowercase name, item), ...],
+# memoized substring lookups: lowercase query -> item or None)
+NameIndex = Tuple[
+    Dict[str, Dict[str, Any]],
+    List[Tuple[str, Dict[str, Any]]],
+    Dict[str, Optional[Dict[str, Any]]]
+]
+
+
+def _build_name_index(items: List[Dict[str, Any]]) -> NameIndex:
+    """Lowercase every item name once for repeated lookups."""
+    exact: Dict[str, Dict[str, Any]] = {}
+    scan: List[Tuple[str, Dict[str, Any]]] = []
+    for item in items:
+        lower_name = item["name"].lower()
+        exact.setdefault(lower_name, item)
+        scan.append((lower_name, item))
+    return exact, scan, {}
+
+
+def _match_name(index: NameIndex, name: str) -> Optional[Dict[str, Any]]:
+    """Find item by exact name first, falling back to a memoized substring match."""
+    exact, scan, substring_matches = index
+    needle = name.lower()
+    if (hit := exact.get(needle)) is not None:
+        return hit
+    if needle not in substring_matches:
+        substring_matches[needle] = next(
+            (item for lower_name, item in scan if needle in lower_name), None
+        )
+    return substring_matches[needle]
+
 
 class ClockodoClient:
     """Async HTTP client for Clockodo API."""
 
-    def __init__(self, email: Optional[str] = None, api_key: Optional[str] = None):
-        """Initialize Clockodo client with credentials."""
+    def __init__(self, email: Optional[str] = None, api_key: Optional[str] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Initialize Clockodo client with credentials and an optional custom transport."""
         self.email = email or os.getenv("CLOCKODO_EMAIL")
         self.api_key = api_key or os.getenv("CLOCKODO_API_KEY")
         self.base_url = "https://my.clockodo.com/api/v2"
@@ -41,14 +88,33 @@ class ClockodoClient:
             "Content-Type": "application/json"
         }
 
+        # Single pooled client so keep-alive connections are reused across calls;
+        # HTTP/2 lets concurrent requests share one connection (falls back to HTTP/1.1).
+        # The transport retries failed connection attempts for every method.
+        transport = transport or httpx.AsyncHTTPTransport(
+            retries=2,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10, keepalive_expiry=60.0)
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(15.0),
+            transport=transport
+        )
+
+        # TTL cache for stable lookups: key -> (expires_at, value)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
+
         logger.info("ClockodoClient initialized", extra={"clockodo_email": self.email})
 
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make authenticated request to Clockodo API."""
-        url = f"{self.base_url}{endpoint}"
-
-        async with httpx.AsyncClient() as client:
-            try:
+        # Skip building the debug payloads entirely unless debug logging is on
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        try:
+            if debug_enabled:
                 logger.debug(
                     "Sending request to Clockodo",
                     extra={
@@ -58,9 +124,8 @@ class ClockodoClient:
                         "has_json": "json" in kwargs
                     }
                 )
-                response = await client.request(
-                    method, url, headers=self.headers, **kwargs
-                )
+            response = await self._send(method, endpoint, **kwargs)
+            if debug_enabled:
                 logger.debug(
                     "Received response from Clockodo",
                     extra={
@@ -69,34 +134,74 @@ class ClockodoClient:
                         "endpoint": endpoint
                     }
                 )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                error_detail = ""
-                try:
-                    error_data = e.response.json()
-                    error_detail = error_data.get("message", str(e))
-                except:
-                    error_detail = str(e)
-                logger.error(
-                    "Clockodo API returned error",
-                    extra={
-                        "status_code": e.response.status_code,
-                        "method": method,
-                        "endpoint": endpoint,
-                        "error_detail": error_detail
-                    }
-                )
-                raise ClockodoAPIError(f"API Error {e.response.status_code}: {error_detail}")
-            except Exception as e:
-                logger.exception(
-                    "Unexpected error while calling Clockodo",
-                    extra={
-                        "method": method,
-                        "endpoint": endpoint
-                    }
-                )
-                raise ClockodoAPIError(f"Request failed: {str(e)}")
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error_detail = ""
+            try:
+                error_data = e.response.json()
+                error_detail = error_data.get("message", str(e))
+            except (ValueError, AttributeError):
+                error_detail = str(e)
+            logger.error(
+                "Clockodo API returned error",
+                extra={
+                    "status_code": e.response.status_code,
+                    "method": method,
+                    "endpoint": endpoint,
+                    "error_detail": error_detail
+                }
+            )
+            raise ClockodoAPIError(f"API Error {e.response.status_code}: {error_detail}")
+        except Exception as e:
+            logger.exception(
+                "Unexpected error while calling Clockodo",
+                extra={
+                    "method": method,
+                    "endpoint": endpoint
+                }
+            )
+            raise ClockodoAPIError(f"Request failed: {str(e)}")
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send request, retrying reads on timeouts and server errors."""
+        attempts = MAX_ATTEMPTS if method in RETRYABLE_METHODS else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await self._client.request(method, endpoint, **kwargs)
+            except httpx.ConnectTimeout:
+                # Connection failures are already retried by the transport
+                raise
+            except httpx.TimeoutException:
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code < 500 or last_attempt:
+                    return response
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    async def _cached(self, key: str, ttl: float,
+                      factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return cached value for key, refreshing it via factory once expired."""
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have filled the cache while we waited
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+
+            value = await factory()
+            self._cache[key] = (time.monotonic() + ttl, value)
+            return value
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
 
     # Clock/Timer operations
     async def start_clock(self, customers_id: int, projects_id: Optional[int] = None,
@@ -181,31 +286,89 @@ class ClockodoClient:
 
     # Resource operations
     async def get_customers(self) -> List[Dict[str, Any]]:
-        """Get all customers."""
+        """Get all customers (cached)."""
+        customers, _ = await self._get_customers_indexed()
+        return customers
+
+    async def _get_customers_indexed(self) -> Tuple[List[Dict[str, Any]], NameIndex]:
+        return await self._cached("customers", RESOURCE_CACHE_TTL, self._fetch_customers)
+
+    async def _fetch_customers(self) -> Tuple[List[Dict[str, Any]], NameIndex]:
         result = await self._request("GET", "/customers")
-        return result.get("customers", [])
+        customers = result.get("customers", [])
+        return customers, _build_name_index(customers)
+
+    async def find_customer(self, name: str) -> Optional[Dict[str, Any]]:
+        """Find customer by name (exact match first, then substring)."""
+        _, index = await self._get_customers_indexed()
+        return _match_name(index, name)
 
     async def get_projects(self, customers_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get projects, optionally filtered by customer."""
+        """Get projects, optionally filtered by customer (cached per customer)."""
+        projects, _ = await self._get_projects_indexed(customers_id)
+        return projects
+
+    async def _get_projects_indexed(self, customers_id: Optional[int]) -> Tuple[List[Dict[str, Any]], NameIndex]:
+        return await self._cached(
+            f"projects:{customers_id or 'all'}",
+            RESOURCE_CACHE_TTL,
+            lambda: self._fetch_projects(customers_id)
+        )
+
+    async def _fetch_projects(self, customers_id: Optional[int]) -> Tuple[List[Dict[str, Any]], NameIndex]:
         params = {}
         if customers_id:
             params["customers_id"] = customers_id
 
         result = await self._request("GET", "/projects", params=params)
-        return result.get("projects", [])
+        projects = result.get("projects", [])
+        return projects, _build_name_index(projects)
+
+    async def find_project(self, customers_id: int, name: str) -> Optional[Dict[str, Any]]:
+        """Find project of a customer by name (exact match first, then substring)."""
+        _, index = await self._get_projects_indexed(customers_id)
+        return _match_name(index, name)
 
     async def get_services(self) -> List[Dict[str, Any]]:
-        """Get all services."""
+        """Get all services (cached)."""
+        services, _ = await self._get_services_indexed()
+        return services
+
+    async def _get_services_indexed(self) -> Tuple[List[Dict[str, Any]], NameIndex]:
+        return await self._cached("services", RESOURCE_CACHE_TTL, self._fetch_services)
+
+    async def _fetch_services(self) -> Tuple[List[Dict[str, Any]], NameIndex]:
         result = await self._request("GET", "/services")
-        return result.get("services", [])
+        services = result.get("services", [])
+        return services, _build_name_index(services)
+
+    async def find_service(self, name: str) -> Optional[Dict[str, Any]]:
+        """Find service by name (exact match first, then substring)."""
+        _, index = await self._get_services_indexed()
+        return _match_name(index, name)
 
     async def get_users(self) -> List[Dict[str, Any]]:
-        """Get all users."""
+        """Get all users (cached)."""
+        return await self._cached("users", RESOURCE_CACHE_TTL, self._fetch_users)
+
+    async def _fetch_users(self) -> List[Dict[str, Any]]:
         result = await self._request("GET", "/users")
         return result.get("users", [])
 
+    async def get_resources_bundle(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch customers, services and users concurrently, warming their caches."""
+        customers, services, users = await asyncio.gather(
+            self.get_customers(),
+            self.get_services(),
+            self.get_users()
+        )
+        return customers, services, users
+
     async def get_current_user_id(self) -> int:
-        """Get current user ID by email."""
+        """Get current user ID by email (cached)."""
+        return await self._cached("current_user_id", USER_ID_CACHE_TTL, self._resolve_current_user_id)
+
+    async def _resolve_current_user_id(self) -> int:
         users = await self.get_users()
         current_user = next((user for user in users if user["email"] == self.email), None)
         if not current_user:
@@ -228,8 +391,6 @@ class ClockodoClient:
 
     async def get_week_entries(self, year: int, week: int) -> List[Dict[str, Any]]:
         """Get entries for a specific week."""
-        from datetime import timedelta
-
         # Calculate week start and end
         jan_1 = date(year, 1, 1)
         week_start = jan_1 + timedelta(weeks=week-1, days=-jan_1.weekday())
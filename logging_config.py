@@ -1,8 +1,11 @@
 """Logging configuration for the Clockodo MCP server."""
 
 from pathlib import Path
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
 LOG_DIR = Path(__file__).resolve().parent / "logs"
 LOG_FILE = LOG_DIR / "clockodo.log"
@@ -10,17 +13,42 @@ LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
 MAX_LOG_BYTES = 1_000_000
 BACKUP_COUNT = 3
 
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging(level: int = logging.INFO) -> None:
-    """Configure application-wide logging with a rotating file handler."""
+    """Configure application-wide logging with a queued rotating file handler.
+
+    Records are handed to an in-memory queue and written to disk by a
+    background thread, so logging never blocks the asyncio event loop.
+    The listener lives for the whole process and is stopped at exit.
+    """
+    global _listener
+
     if logging.getLogger().handlers:
         return
 
     LOG_DIR.mkdir(exist_ok=True)
 
-    handler = RotatingFileHandler(LOG_FILE, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT)
-    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
 
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
-    root_logger.addHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+
+def shutdown_logging() -> None:
+    """Flush pending log records and stop the background listener."""
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    _listener = None
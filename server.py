@@ -3,9 +3,11 @@ Clockodo MCP Server - Time tracking tools and resources for Claude Desktop.
 Provides comprehensive integration with Clockodo API for time management.
 """
 
+import asyncio
 import json
 import logging
-from datetime import datetime, date, timedelta
+from collections import defaultdict
+from datetime import datetime, date, timedelta, timezone
 from typing import Optional, List, Dict, Any
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
@@ -16,11 +18,15 @@ from clockodo_client import ClockodoClient, ClockodoAPIError
 
 logger = logging.getLogger(__name__)
 
+# Python 3.11+ parses the trailing "Z" of Clockodo timestamps natively
+_parse_timestamp = datetime.fromisoformat
+
 
 @dataclass
 class AppContext:
-    """Application context with Clockodo client."""
+    """Application context with Clockodo client and resolved current user."""
     clockodo: ClockodoClient
+    current_user_id: Optional[int] = None
 
 
 @asynccontextmanager
@@ -30,11 +36,56 @@ async def app_lifespan(server: FastMCP):
         logger.info("Initializing ClockodoClient for application lifespan")
         clockodo = ClockodoClient()
         logger.info("ClockodoClient initialized successfully")
-        yield AppContext(clockodo=clockodo)
     except Exception as e:
         logger.exception("Failed to initialize Clockodo client")
         raise
 
+    try:
+        # Warm the lookup caches in one parallel burst before the first tool call;
+        # best effort, since the caches also fill lazily
+        try:
+            await clockodo.get_resources_bundle()
+        except ClockodoAPIError as e:
+            logger.warning("Failed to prefetch Clockodo resources, continuing with cold caches", exc_info=e)
+
+        # The current user never changes for the process; resolved from the cached users.
+        # Only entry tools need it, so a failure here is retried lazily on first use.
+        current_user_id = None
+        try:
+            current_user_id = await clockodo.get_current_user_id()
+            logger.info("Resolved current Clockodo user", extra={"user_id": current_user_id})
+        except Exception:
+            logger.exception("Failed to resolve current Clockodo user, will retry on first use")
+
+        yield AppContext(clockodo=clockodo, current_user_id=current_user_id)
+    finally:
+        logger.info("Closing ClockodoClient connection pool")
+        await clockodo.aclose()
+
+
+async def _get_current_user_id(app_context: AppContext) -> int:
+    """Return the current user ID, resolving it if startup resolution failed."""
+    if app_context.current_user_id is None:
+        app_context.current_user_id = await app_context.clockodo.get_current_user_id()
+    return app_context.current_user_id
+
+
+async def _find_project_and_service(
+    clockodo: ClockodoClient,
+    customers_id: int,
+    project_name: Optional[str],
+    service_name: Optional[str]
+) -> tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Look up project and service concurrently, skipping lookups that aren't needed."""
+    async def _none() -> None:
+        return None
+
+    project, service = await asyncio.gather(
+        clockodo.find_project(customers_id, project_name) if project_name else _none(),
+        clockodo.find_service(service_name) if service_name else _none()
+    )
+    return project, service
+
 
 # Create FastMCP server with lifespan management
 mcp = FastMCP("Clockodo Time Tracker", lifespan=app_lifespan)
@@ -73,21 +124,24 @@ async def start_time_tracking(
 
         clockodo = ctx.request_context.lifespan_context.clockodo
 
-        # Get customers to find ID
-        customers = await clockodo.get_customers()
-        customer = next((c for c in customers if customer_name.lower() in c["name"].lower()), None)
+        # Find customer ID
+        customer = await clockodo.find_customer(customer_name)
         if not customer:
             logger.warning("Customer not found in start_time_tracking", extra={"customer_name": customer_name})
+            customers = await clockodo.get_customers()
             return f"Customer '{customer_name}' not found. Available customers: {', '.join([c['name'] for c in customers[:5]])}"
 
         customers_id = customer["id"]
         projects_id = None
         services_id = None
 
+        # Look up project and service concurrently
+        project, service = await _find_project_and_service(
+            clockodo, customers_id, project_name, service_name
+        )
+
         # Find project if specified
         if project_name:
-            projects = await clockodo.get_projects(customers_id)
-            project = next((p for p in projects if project_name.lower() in p["name"].lower()), None)
             if project:
                 projects_id = project["id"]
             else:
@@ -99,8 +153,6 @@ async def start_time_tracking(
 
         # Find service if specified
         if service_name:
-            services = await clockodo.get_services()
-            service = next((s for s in services if service_name.lower() in s["name"].lower()), None)
             if service:
                 services_id = service["id"]
             else:
@@ -163,8 +215,8 @@ async def stop_time_tracking(ctx: Context = None) -> str:
 
         # Calculate duration
         if running and "time_since" in running:
-            start_time = datetime.fromisoformat(running["time_since"].replace("Z", "+00:00"))
-            duration = datetime.now() - start_time.replace(tzinfo=None)
+            start_time = _parse_timestamp(running["time_since"])
+            duration = datetime.now(timezone.utc) - start_time
             hours = duration.total_seconds() / 3600
 
             return f"⏹️ Time tracking stopped. Duration: {hours:.2f} hours"
@@ -212,11 +264,11 @@ async def get_running_entry(ctx: Context = None) -> str:
             info += f"\nDescription: {description}"
         if start_time:
             try:
-                start = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-                duration = datetime.now() - start.replace(tzinfo=None)
+                start = _parse_timestamp(start_time)
+                duration = datetime.now(timezone.utc) - start
                 hours = duration.total_seconds() / 3600
                 info += f"\nDuration: {hours:.2f} hours (started {start.strftime('%H:%M')})"
-            except:
+            except (ValueError, TypeError):
                 info += f"\nStarted: {start_time}"
 
         return info
@@ -277,8 +329,7 @@ async def create_time_entry(
         datetime.strptime(time_until, "%Y-%m-%d %H:%M:%S")
 
         # Find customer
-        customers = await clockodo.get_customers()
-        customer = next((c for c in customers if customer_name.lower() in c["name"].lower()), None)
+        customer = await clockodo.find_customer(customer_name)
         if not customer:
             logger.warning("Customer not found in create_time_entry", extra={"customer_name": customer_name})
             return f"Customer '{customer_name}' not found"
@@ -287,19 +338,15 @@ async def create_time_entry(
         projects_id = None
         services_id = None
 
-        # Find project if specified
-        if project_name:
-            projects = await clockodo.get_projects(customers_id)
-            project = next((p for p in projects if project_name.lower() in p["name"].lower()), None)
-            if project:
-                projects_id = project["id"]
+        # Look up project and service concurrently
+        project, service = await _find_project_and_service(
+            clockodo, customers_id, project_name, service_name
+        )
 
-        # Find service if specified
-        if service_name:
-            services = await clockodo.get_services()
-            service = next((s for s in services if service_name.lower() in s["name"].lower()), None)
-            if service:
-                services_id = service["id"]
+        if project:
+            projects_id = project["id"]
+        if service:
+            services_id = service["id"]
 
         # Create entry
         result = await clockodo.create_entry(
@@ -386,8 +433,8 @@ async def get_time_entries(period: str, ctx: Context = None) -> str:
             logger.info("No entries found for period", extra={"period": period})
             return f"No time entries found for {period}"
 
-        # Get current user ID and filter entries
-        current_user_id = await clockodo.get_current_user_id()
+        # Filter entries for current user
+        current_user_id = await _get_current_user_id(ctx.request_context.lifespan_context)
         user_entries = [entry for entry in entries if entry.get("users_id") == current_user_id]
 
         if not user_entries:
@@ -396,7 +443,7 @@ async def get_time_entries(period: str, ctx: Context = None) -> str:
 
         # Format entries
         total_hours = 0
-        result = f"📊 Time entries for {period}:\n\n"
+        parts: List[str] = [f"📊 Time entries for {period}:", ""]
 
         for entry in user_entries:
             customer = entry.get("customers_name", "Unknown")
@@ -404,28 +451,34 @@ async def get_time_entries(period: str, ctx: Context = None) -> str:
             service = entry.get("services_name", "")
             text = entry.get("text", "")
 
-            # Parse times
+            # Clockodo reports the duration in seconds (null while running);
+            # timestamps are only needed for display
             try:
-                start = datetime.fromisoformat(entry["time_since"].replace("Z", "+00:00"))
-                end = datetime.fromisoformat(entry["time_until"].replace("Z", "+00:00"))
-                duration = (end - start).total_seconds() / 3600
-                total_hours += duration
-
-                result += f"• {start.strftime('%m/%d %H:%M')}-{end.strftime('%H:%M')} "
-                result += f"{customer}"
-                if project:
-                    result += f" - {project}"
-                if service:
-                    result += f" ({service})"
-                result += f" [{duration:.2f}h]"
+                start = _parse_timestamp(entry["time_since"])
+                # Fixed formats rendered directly, avoiding strftime's format parsing
+                start_label = f"{start.month:02d}/{start.day:02d} {start.hour:02d}:{start.minute:02d}"
+                project_label = f" - {project}" if project else ""
+                service_label = f" ({service})" if service else ""
+
+                if entry.get("duration") is None:
+                    # Running entries have no end or duration yet and don't count towards the total
+                    parts.append(f"• {start_label}- {customer}{project_label}{service_label} (running)")
+                else:
+                    duration = entry["duration"] / 3600
+                    end = _parse_timestamp(entry["time_until"])
+                    total_hours += duration
+                    end_label = f"{end.hour:02d}:{end.minute:02d}"
+                    parts.append(
+                        f"• {start_label}-{end_label} {customer}{project_label}{service_label} [{duration:.2f}h]"
+                    )
                 if text:
-                    result += f"\n  📝 {text}"
-                result += "\n"
-            except:
-                result += f"• {customer} - Invalid time format\n"
+                    parts.append(f"  📝 {text}")
+            except (KeyError, ValueError, TypeError):
+                parts.append(f"• {customer} - Invalid time format")
 
-        result += f"\n⏱️ Total: {total_hours:.2f} hours"
-        return result
+        parts.append("")
+        parts.append(f"⏱️ Total: {total_hours:.2f} hours")
+        return "\n".join(parts)
 
     except ClockodoAPIError as e:
         logger.error("Clockodo API error while getting entries", exc_info=e)
@@ -452,11 +505,8 @@ async def get_all_customers(ctx: Context = None) -> str:
             logger.info("No customers found via API")
             return "No customers found"
 
-        result = "👥 Customers:\n\n"
-        for customer in customers:
-            result += f"• {customer['name']} (ID: {customer['id']})\n"
-
-        return result
+        body = "\n".join(f"• {customer['name']} (ID: {customer['id']})" for customer in customers)
+        return f"👥 Customers:\n\n{body}"
 
     except ClockodoAPIError as e:
         logger.error("Clockodo API error while getting customers", exc_info=e)
@@ -479,8 +529,7 @@ async def get_customer_projects(customer_name: str, ctx: Context = None) -> str:
         clockodo = ctx.request_context.lifespan_context.clockodo
 
         # Find customer
-        customers = await clockodo.get_customers()
-        customer = next((c for c in customers if customer_name.lower() in c["name"].lower()), None)
+        customer = await clockodo.find_customer(customer_name)
         if not customer:
             logger.warning("Customer not found in get_customer_projects", extra={"customer_name": customer_name})
             return f"Customer '{customer_name}' not found"
@@ -491,11 +540,8 @@ async def get_customer_projects(customer_name: str, ctx: Context = None) -> str:
             logger.info("No projects found for customer", extra={"customer_id": customer["id"]})
             return f"No projects found for {customer['name']}"
 
-        result = f"📁 Projects for {customer['name']}:\n\n"
-        for project in projects:
-            result += f"• {project['name']} (ID: {project['id']})\n"
-
-        return result
+        body = "\n".join(f"• {project['name']} (ID: {project['id']})" for project in projects)
+        return f"📁 Projects for {customer['name']}:\n\n{body}"
 
     except ClockodoAPIError as e:
         logger.error("Clockodo API error while getting customer projects", exc_info=e)
@@ -522,11 +568,8 @@ async def get_all_services(ctx: Context = None) -> str:
             logger.info("No services found via API")
             return "No services found"
 
-        result = "🔧 Services:\n\n"
-        for service in services:
-            result += f"• {service['name']} (ID: {service['id']})\n"
-
-        return result
+        body = "\n".join(f"• {service['name']} (ID: {service['id']})" for service in services)
+        return f"🔧 Services:\n\n{body}"
 
     except ClockodoAPIError as e:
         logger.error("Clockodo API error while getting services", exc_info=e)
@@ -546,14 +589,16 @@ async def get_all_users(ctx: Context = None) -> str:
         if not users:
             return "No users found"
 
-        result = "👥 Users:\n\n"
+        parts: List[str] = ["👥 Users:", ""]
         for user in users:
             status = "✅ Active" if user.get("active") else "❌ Inactive"
-            result += f"• {user['name']} (ID: {user['id']})\n"
-            result += f"  📧 {user.get('email', 'No email')}\n"
-            result += f"  🎭 Role: {user.get('role', 'Unknown')} | Status: {status}\n\n"
+            parts.append(
+                f"• {user['name']} (ID: {user['id']})\n"
+                f"  📧 {user.get('email', 'No email')}\n"
+                f"  🎭 Role: {user.get('role', 'Unknown')} | Status: {status}\n"
+            )
 
-        return result
+        return "\n".join(parts)
 
     except ClockodoAPIError as e:
         return f"❌ Error getting users: {e}"
@@ -601,47 +646,44 @@ async def get_work_summary(period: str = "week", ctx: Context = None) -> str:
         if not entries:
             return f"No time entries for {period}"
 
-        # Get current user ID and filter entries
-        current_user_id = await clockodo.get_current_user_id()
+        # Filter entries for current user
+        current_user_id = await _get_current_user_id(ctx.request_context.lifespan_context)
         user_entries = [entry for entry in entries if entry.get("users_id") == current_user_id]
 
         if not user_entries:
             return f"No time entries found for your user for {period}"
 
         # Group by customer and project
-        summary = {}
+        summary: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
         total_hours = 0
 
         for entry in user_entries:
+            # Running entries have no duration yet and are left out of the summary
+            if entry.get("duration") is None:
+                continue
             try:
-                start = datetime.fromisoformat(entry["time_since"].replace("Z", "+00:00"))
-                end = datetime.fromisoformat(entry["time_until"].replace("Z", "+00:00"))
-                duration = (end - start).total_seconds() / 3600
+                # Use the API-provided duration (seconds) instead of parsing timestamps
+                duration = entry["duration"] / 3600
                 total_hours += duration
 
                 customer = entry.get("customers_name", "Unknown")
                 project = entry.get("projects_name", "General")
 
-                if customer not in summary:
-                    summary[customer] = {}
-                if project not in summary[customer]:
-                    summary[customer][project] = 0
                 summary[customer][project] += duration
-            except:
+            except (KeyError, ValueError, TypeError):
                 continue
 
         # Format summary
-        result = f"📊 Work Summary ({period}):\n\n"
-        result += f"⏱️ Total Hours: {total_hours:.2f}h\n\n"
+        parts: List[str] = [f"📊 Work Summary ({period}):", "", f"⏱️ Total Hours: {total_hours:.2f}h", ""]
 
+        customer_totals = {customer: sum(projects.values()) for customer, projects in summary.items()}
         for customer, projects in summary.items():
-            customer_total = sum(projects.values())
-            result += f"👤 {customer}: {customer_total:.2f}h\n"
+            parts.append(f"👤 {customer}: {customer_totals[customer]:.2f}h")
             for project, hours in projects.items():
-                result += f"  📁 {project}: {hours:.2f}h\n"
-            result += "\n"
+                parts.append(f"  📁 {project}: {hours:.2f}h")
+            parts.append("")
 
-        return result
+        return "\n".join(parts)
 
     except ClockodoAPIError as e:
         return f"❌ Error getting summary: {e}"
@@ -0,0 +1,251 @@
+"""Tests for ClockodoClient retry handling and lookup caching."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import clockodo_client
+from clockodo_client import ClockodoClient, ClockodoAPIError, MAX_ATTEMPTS
+
+
+@pytest.fixture
+def make_client():
+    """Create clients whose HTTP traffic is served by a handler, closing them afterwards."""
+    clients = []
+
+    def factory(handler) -> ClockodoClient:
+        client = ClockodoClient(
+            email="user@example.com",
+            api_key="secret",
+            transport=httpx.MockTransport(handler)
+        )
+        clients.append(client)
+        return client
+
+    yield factory
+
+    for client in clients:
+        asyncio.run(client.aclose())
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    monkeypatch.setattr(clockodo_client, "RETRY_BACKOFF", 0)
+
+
+def test_get_retries_server_errors_up_to_max_attempts(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, json={"message": "unavailable"})
+
+    client = make_client(handler)
+
+    with pytest.raises(ClockodoAPIError, match="503"):
+        asyncio.run(client.get_entries("2024-01-01T00:00:00Z", "2024-01-01T23:59:59Z"))
+
+    assert len(calls) == MAX_ATTEMPTS
+
+
+def test_get_succeeds_after_transient_server_error(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(502)
+        return httpx.Response(200, json={"entries": [{"id": 1}]})
+
+    client = make_client(handler)
+
+    entries = asyncio.run(client.get_entries("2024-01-01T00:00:00Z", "2024-01-01T23:59:59Z"))
+
+    assert entries == [{"id": 1}]
+    assert len(calls) == 2
+
+
+def test_post_is_sent_exactly_once(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(500, json={"message": "boom"})
+
+    client = make_client(handler)
+
+    with pytest.raises(ClockodoAPIError, match="500"):
+        asyncio.run(client.create_entry(1, "2024-01-01 09:00:00", "2024-01-01 10:00:00"))
+
+    assert len(calls) == 1
+    assert calls[0].method == "POST"
+
+
+def test_delete_clock_is_not_retried(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    client = make_client(handler)
+
+    with pytest.raises(ClockodoAPIError):
+        asyncio.run(client.stop_clock())
+
+    assert len(calls) == 1
+
+
+def test_timeout_on_last_attempt_raises_api_error(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    client = make_client(handler)
+
+    with pytest.raises(ClockodoAPIError, match="Request failed"):
+        asyncio.run(client.get_entries("2024-01-01T00:00:00Z", "2024-01-01T23:59:59Z"))
+
+    assert len(calls) == MAX_ATTEMPTS
+
+
+def test_connect_timeout_is_not_retried_by_application(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ConnectTimeout("connect timed out", request=request)
+
+    client = make_client(handler)
+
+    with pytest.raises(ClockodoAPIError, match="Request failed"):
+        asyncio.run(client.get_entries("2024-01-01T00:00:00Z", "2024-01-01T23:59:59Z"))
+
+    assert len(calls) == 1
+
+
+def test_customers_are_served_from_cache(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"customers": [{"id": 1, "name": "Acme"}]})
+
+    client = make_client(handler)
+
+    async def fetch_twice():
+        return await client.get_customers(), await client.get_customers()
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert first == second == [{"id": 1, "name": "Acme"}]
+    assert len(calls) == 1
+
+
+def test_expired_cache_entry_is_refetched(make_client, monkeypatch):
+    monkeypatch.setattr(clockodo_client, "RESOURCE_CACHE_TTL", 0)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"services": [{"id": len(calls), "name": "Dev"}]})
+
+    client = make_client(handler)
+
+    async def fetch_twice():
+        return await client.get_services(), await client.get_services()
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert first == [{"id": 1, "name": "Dev"}]
+    assert second == [{"id": 2, "name": "Dev"}]
+    assert len(calls) == 2
+
+
+def test_concurrent_cold_callers_fetch_once(make_client):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        # Yield so the other callers reach the cache while this fetch is in flight
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"users": [{"id": 7, "email": "user@example.com"}]})
+
+    client = make_client(handler)
+
+    async def fetch_concurrently():
+        return await asyncio.gather(*(client.get_users() for _ in range(5)))
+
+    results = asyncio.run(fetch_concurrently())
+
+    assert all(users == [{"id": 7, "email": "user@example.com"}] for users in results)
+    assert len(calls) == 1
+
+
+def customers_handler(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"customers": [
+            {"id": 1, "name": "Acme Corp"},
+            {"id": 2, "name": "Acme"},
+            {"id": 3, "name": "Globex"}
+        ]})
+    return handler
+
+
+def test_find_customer_prefers_exact_match_over_earlier_substring(make_client):
+    client = make_client(customers_handler([]))
+
+    customer = asyncio.run(client.find_customer("ACME"))
+
+    assert customer["id"] == 2
+
+
+def test_find_customer_falls_back_to_substring_match(make_client):
+    client = make_client(customers_handler([]))
+
+    customer = asyncio.run(client.find_customer("corp"))
+
+    assert customer["id"] == 1
+
+
+def test_find_customer_returns_none_when_nothing_matches(make_client):
+    calls = []
+    client = make_client(customers_handler(calls))
+
+    async def find_twice():
+        return await client.find_customer("Initech"), await client.find_customer("Initech")
+
+    assert asyncio.run(find_twice()) == (None, None)
+    assert len(calls) == 1
+
+
+def test_find_project_uses_per_customer_cache(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        customers_id = int(request.url.params["customers_id"])
+        return httpx.Response(200, json={"projects": [
+            {"id": customers_id * 10, "name": "Website"},
+            {"id": customers_id * 10 + 1, "name": "Website Relaunch"}
+        ]})
+
+    client = make_client(handler)
+
+    async def find_projects():
+        return (
+            await client.find_project(1, "website"),
+            await client.find_project(1, "relaunch"),
+            await client.find_project(2, "website")
+        )
+
+    first, second, other_customer = asyncio.run(find_projects())
+
+    assert first["id"] == 10
+    assert second["id"] == 11
+    assert other_customer["id"] == 20
+    assert [request.url.params["customers_id"] for request in calls] == ["1", "2"]